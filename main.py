@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 import json
+from concurrent.futures import ThreadPoolExecutor
 from phishing_detector import PhishingDetector
 
 def main():
     detector = PhishingDetector()
-    
+
     # Test URLs
     test_urls = [
         "https://secure-login-amazon.tk/verify",
@@ -12,12 +13,12 @@ def main():
         "https://google.com",
         "https://paypal-security-update.ml/account"
     ]
-    
-    results = []
-    for url in test_urls:
-        result = detector.analyze_url(url)
-        results.append(result)
-        
+
+    # Analyze concurrently - each URL is dominated by network latency
+    with ThreadPoolExecutor(max_workers=min(32, len(test_urls))) as executor:
+        results = list(executor.map(detector.analyze_url, test_urls))
+
+    for url, result in zip(test_urls, results):
         print(f"\nURL: {url}")
         print(f"Risk Level: {result['risk_level']}")
         print(f"AI Score: {result['ai_score']:.2f}")
@@ -2,87 +2,486 @@ import json
 import urllib.request
 import urllib.robotparser
 from urllib.parse import urlparse
+import asyncio
+import csv
+import os
 import re
+import threading
+from functools import lru_cache
+from cachetools import TTLCache
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = None
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 from typing import Dict, List, Any
 import ssl
 import socket
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+try:
+    import lxml  # noqa: F401  (C-accelerated parser, ~10x html.parser)
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
 import whois
+import tldextract
 from datetime import datetime
 import certifi
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Content analysis only inspects these tags, so parsing is restricted to
+# them; page bodies are capped to keep huge pages from dominating a scan.
+MAX_CONTENT_BYTES = 512_000
+_CONTENT_STRAINER = SoupStrainer(['form', 'input', 'a', 'title', 'link'])
+
+
+def _compile_regex(pattern: str, ignorecase: bool = False):
+    """Compile with RE2's linear-time engine when installed.
+
+    google-re2 takes no flag argument; case-insensitivity goes through
+    re2.Options. Falls back to stdlib re only when RE2 rejects the
+    pattern itself (re2.error), so an API misuse surfaces instead of
+    silently downgrading every pattern to the backtracking engine.
+    """
+    if _re2 is not None:
+        opts = _re2.Options()
+        opts.case_sensitive = not ignorecase
+        try:
+            return _re2.compile(pattern, options=opts)
+        except _re2.error:
+            pass
+    return re.compile(pattern, re.IGNORECASE if ignorecase else 0)
+
+
+@lru_cache(maxsize=16)
+def _load_config_cached(path: str, mtime: float) -> Dict[str, Any]:
+    # mtime is part of the key purely to invalidate on file change.
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _score_batch(has_ip, n_patterns, domain_len, subdomain_count,
+                 ssl_valid, ssl_self_signed, n_keywords, has_password,
+                 n_external, is_new_domain, is_whitelisted):
+    """Batch kernel mirroring rule_based_scoring over parallel arrays"""
+    n = has_ip.shape[0]
+    scores = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        if is_whitelisted[i]:
+            scores[i] = 0.0
+            continue
+        score = 0.2 * n_patterns[i] + 0.1 * n_keywords[i]
+        if has_ip[i]:
+            score += 0.3
+        if domain_len[i] > 30:
+            score += 0.1
+        if subdomain_count[i] > 3:
+            score += 0.2
+        if not ssl_valid[i]:
+            score += 0.3
+        if ssl_self_signed[i]:
+            score += 0.2
+        if has_password[i]:
+            score += 0.1
+        if n_external[i] > 10:
+            score += 0.1
+        if is_new_domain[i]:
+            score += 0.2
+        scores[i] = min(1.0, max(0.0, score))
+    return scores
+
+
+if njit is not None:
+    _score_batch = njit(fastmath=True, cache=True)(_score_batch)
 
 class PhishingDetector:
+    SUSPICIOUS_KEYWORDS = (
+        'verify account', 'suspended', 'urgent action',
+        'click here immediately', 'limited time', 'act now',
+        'confirm identity', 'update payment', 'security alert'
+    )
+
     def __init__(self, config_file: str = "detector_config.json"):
         self.config = self.load_config(config_file)
-        self.suspicious_patterns = self.config.get("suspicious_patterns", [])
         self.whitelist_domains = self.config.get("whitelist_domains", [])
+        # Whitelist hits are checked by registered domain (eTLD+1), so
+        # www.google.com and google.com:443 both match "google.com".
+        # suffix_list_urls=() pins the bundled suffix snapshot, no network.
+        self._whitelist = frozenset(d.lower() for d in self.whitelist_domains)
+        self._tld = tldextract.TLDExtract(suffix_list_urls=())
+
+        # Pattern config entries are either a plain regex string or a dict
+        # {"pattern": ..., "literals": [...]} where literals are cheap
+        # substrings, any of which must appear before the regex is run.
+        self.suspicious_patterns = []
+        self._suspicious_compiled = []
+        for entry in self.config.get("suspicious_patterns", []):
+            if isinstance(entry, dict):
+                pattern = entry["pattern"]
+                literals = [lit.lower() for lit in entry.get("literals", [])]
+                if not literals:
+                    literals = self._extract_literals(pattern)
+            else:
+                pattern = entry
+                literals = self._extract_literals(pattern)
+            self.suspicious_patterns.append(pattern)
+            self._suspicious_compiled.append(
+                (pattern, self._compile_pattern(pattern), literals)
+            )
+        self._combined = self._compile_combined()
+        self._ip_re = _compile_regex(r'\d+\.\d+\.\d+\.\d+')
+
+        # Aho-Corasick automaton finds every keyword in one pass over the
+        # page text instead of one scan per keyword.
+        self._kw_automaton = None
+        if ahocorasick is not None:
+            self._kw_automaton = ahocorasick.Automaton()
+            for kw in self.SUSPICIOUS_KEYWORDS:
+                self._kw_automaton.add_word(kw, kw)
+            self._kw_automaton.make_automaton()
+
+        # Known domain ages answered from memory instead of live WHOIS.
+        self._domain_age_table = self._load_domain_ages(
+            self.config.get("domain_age_table"))
+
+        # One SSLContext for all certificate checks: building it re-parses
+        # the whole CA bundle, which is far too costly per connection.
+        self._ssl_ctx = ssl.create_default_context(cafile=certifi.where())
+
+        # One pooled session for all sync HTTP: repeat hosts reuse the TCP
+        # and TLS connection instead of handshaking per request.
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                              max_retries=1)
+        self._http.mount('https://', adapter)
+        self._http.mount('http://', adapter)
+        self._http.headers.update({'User-Agent': USER_AGENT})
+
+        # Shared aiohttp session, created lazily on first async use so
+        # repeat hosts reuse its connection pool; closed via aclose().
+        self._aiohttp_session = None
+
+        # Per-instance caches: WHOIS and SSL results are keyed by domain,
+        # full analysis results by URL with a TTL so verdicts expire.
+        # TTLCache is not thread-safe (even reads mutate its TTL
+        # bookkeeping), and main.py calls analyze_url from worker threads,
+        # so all access goes through _cache_lock. The lock also covers the
+        # domain-age write-back.
+        self._ssl_cached = lru_cache(maxsize=4096)(self._check_ssl_uncached)
+        self._whois_cached = lru_cache(maxsize=4096)(self._domain_info_uncached)
+        self._result_cache = TTLCache(maxsize=10000, ttl=3600)
+        self._cache_lock = threading.Lock()
+
+    def clear_cache(self):
+        """Drop all cached SSL, WHOIS and analysis results"""
+        self._ssl_cached.cache_clear()
+        self._whois_cached.cache_clear()
+        with self._cache_lock:
+            self._result_cache.clear()
+
+    def _cached_result(self, url: str):
+        with self._cache_lock:
+            return self._result_cache.get(url)
+
+    def _store_result(self, url: str, result: Dict[str, Any]) -> None:
+        with self._cache_lock:
+            self._result_cache[url] = result
+
+    def _compile_combined(self):
+        """Join all patterns into one alternation regex for one-pass scans.
+
+        Each pattern becomes a named group (?P<p0>...), so a single
+        finditer over the URL discovers every matching pattern. Returns
+        None if the joined pattern does not compile (e.g. patterns with
+        conflicting group names); callers then use the per-pattern loop.
+        """
+        if not self.suspicious_patterns:
+            return None
+        joined = '|'.join(
+            f'(?P<p{i}>{p})' for i, p in enumerate(self.suspicious_patterns)
+        )
+        try:
+            return _compile_regex(joined, ignorecase=True)
+        except re.error:
+            return None
+
+    @staticmethod
+    def _compile_pattern(pattern: str):
+        """Compile a pattern with RE2 when available, falling back to re"""
+        return _compile_regex(pattern, ignorecase=True)
+
+    @staticmethod
+    def _extract_literals(pattern: str) -> List[str]:
+        """Extract required literal substrings from a simple pattern.
+
+        Alternations and optionally-quantified groups are skipped entirely
+        because their literals are not required by every match branch;
+        optional atoms and character classes are stripped so only text the
+        regex must match survives. Runs shorter than 3 chars are dropped
+        as too noisy to be worth a substring test.
+        """
+        # Bail on any construct whose literals may be absent from a match:
+        # alternation, or a group followed by ?, * or a {0,n} quantifier.
+        if '|' in pattern or re.search(r'\)(?:[*?]|\{0)', pattern):
+            return []
+        cleaned = re.sub(r'\\.', ' ', pattern)          # escape sequences
+        cleaned = re.sub(r'\[[^\]]*\]', ' ', cleaned)   # character classes
+        cleaned = re.sub(r'.[*?]', ' ', cleaned)        # optional atoms
+        cleaned = re.sub(r'.\{0[^}]*\}', ' ', cleaned)  # {0,n} atoms
+        cleaned = re.sub(r'[(){}+]', ' ', cleaned)
+        return [run.lower() for run in re.findall(r'[a-zA-Z0-9]{3,}', cleaned)]
         
     def load_config(self, config_file: str) -> Dict[str, Any]:
-        """Load configuration from JSON file"""
+        """Load configuration from JSON file.
+
+        The parsed dict is cached per (path, mtime), so repeated
+        instantiations — e.g. under FastAPI workers or in test loops —
+        skip the disk read and JSON parse until the file changes.
+        Instances treat the config as read-only.
+        """
         try:
-            with open(config_file, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
+            mtime = os.path.getmtime(config_file)
+        except OSError:
             return self.create_default_config(config_file)
+        return _load_config_cached(config_file, mtime)
     
     def create_default_config(self, config_file: str) -> Dict[str, Any]:
         """Create default configuration"""
         default_config = {
             "suspicious_patterns": [
-                r"[0-9]+\.[0-9]+\.[0-9]+\.[0-9]+",  # IP addresses
+                r"\b\d{1,3}(?:\.\d{1,3}){3}\b",      # IP addresses
                 r"[a-z]+-[a-z]+\.(tk|ml|ga|cf)",     # Suspicious TLDs
-                r"secure.*login",
-                r"verify.*account"
+                r"\bsecure[\w-]{0,20}login\b",
+                r"\bverify[\w-]{0,20}account\b"
             ],
             "whitelist_domains": [
                 "google.com", "facebook.com", "amazon.com"
             ],
-            "ai_model_endpoint": "http://localhost:8000/predict"
+            "ai_model_endpoint": "http://localhost:8000/predict",
+            "domain_age_table": "domain_ages.csv"
         }
         
         with open(config_file, 'w') as f:
             json.dump(default_config, f, indent=2)
         return default_config
     
-    def analyze_url(self, url: str) -> Dict[str, Any]:
-        """Enhanced URL analysis with SSL and content checking"""
-        parsed_url = urlparse(url)
-        
-        features = {
+    def _build_features(self, url: str, parsed_url, ssl_info: Dict[str, Any],
+                        content: Dict[str, Any],
+                        domain_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Assemble the feature dict shared by the sync and async paths"""
+        return {
             "url": url,
             "domain": parsed_url.netloc,
-            "has_ip": bool(re.search(r'\d+\.\d+\.\d+\.\d+', parsed_url.netloc)),
+            "has_ip": bool(self._ip_re.search(parsed_url.netloc)),
             "suspicious_patterns": self.check_suspicious_patterns(url),
             "domain_length": len(parsed_url.netloc),
             "subdomain_count": len(parsed_url.netloc.split('.')) - 2,
-            "is_whitelisted": parsed_url.netloc in self.whitelist_domains,
-            "ssl_info": self.check_ssl_certificate(parsed_url.netloc),
-            "content_analysis": self.analyze_content(url),
-            "domain_info": self.get_domain_info(parsed_url.netloc)
+            "is_whitelisted": self._registered_domain(parsed_url.netloc)
+                              in self._whitelist,
+            "ssl_info": ssl_info,
+            "content_analysis": content,
+            "domain_info": domain_info
         }
-        
+
+    def _registered_domain(self, netloc: str) -> str:
+        """Reduce a netloc to its eTLD+1 (www.google.com:443 -> google.com).
+
+        Hostnames are case-insensitive and the whitelist is stored
+        lowercased, so the netloc is lowercased before extraction."""
+        ext = self._tld(netloc.lower())
+        if ext.suffix:
+            return f"{ext.domain}.{ext.suffix}"
+        return ext.domain
+
+    def analyze_url(self, url: str) -> Dict[str, Any]:
+        """Enhanced URL analysis with SSL and content checking"""
+        cached = self._cached_result(url)
+        if cached is not None:
+            return cached
+
+        parsed_url = urlparse(url)
+
+        ssl_info = (self.check_ssl_certificate(parsed_url.netloc)
+                    if parsed_url.scheme == 'https'
+                    else self._skipped_ssl_info())
+        features = self._build_features(
+            url, parsed_url,
+            ssl_info,
+            self.analyze_content(url, parsed_url.netloc),
+            self.get_domain_info(parsed_url.netloc)
+        )
+
         ai_score = self.get_ai_prediction(features)
-        
-        return {
+
+        result = {
+            "features": features,
+            "ai_score": ai_score,
+            "risk_level": self.calculate_risk_level(features, ai_score)
+        }
+        self._store_result(url, result)
+        return result
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use.
+
+        One session per detector keeps a single connection pool alive
+        across requests and batches, mirroring the pooled
+        requests.Session on the sync path."""
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            self._aiohttp_session = aiohttp.ClientSession(
+                headers={'User-Agent': USER_AGENT})
+        return self._aiohttp_session
+
+    async def aclose(self):
+        """Close the shared aiohttp session and its connection pool"""
+        if self._aiohttp_session is not None \
+                and not self._aiohttp_session.closed:
+            await self._aiohttp_session.close()
+
+    async def _collect_features_async(self, session: aiohttp.ClientSession,
+                                      url: str) -> Dict[str, Any]:
+        """Gather the SSL, content and WHOIS features for one URL.
+
+        The blocking ssl/whois libraries run in the default executor;
+        the content fetch uses aiohttp directly."""
+        parsed_url = urlparse(url)
+        loop = asyncio.get_running_loop()
+
+        if parsed_url.scheme == 'https':
+            ssl_task = loop.run_in_executor(
+                None, self.check_ssl_certificate, parsed_url.netloc)
+        else:
+            ssl_task = asyncio.sleep(0, result=self._skipped_ssl_info())
+        ssl_info, content, domain_info = await asyncio.gather(
+            ssl_task,
+            self._analyze_content_async(session, url, parsed_url.netloc),
+            loop.run_in_executor(
+                None, self.get_domain_info, parsed_url.netloc)
+        )
+
+        return self._build_features(
+            url, parsed_url, ssl_info, content, domain_info)
+
+    async def analyze_url_async(self, url: str) -> Dict[str, Any]:
+        """Async URL analysis running the SSL, content and WHOIS lookups
+        concurrently instead of paying their latencies back to back"""
+        cached = self._cached_result(url)
+        if cached is not None:
+            return cached
+
+        session = await self._get_session()
+        features = await self._collect_features_async(session, url)
+
+        # The AI call consumes the gathered features, so it cannot
+        # overlap with them.
+        ai_score = await self._get_ai_prediction_async(session, features)
+
+        result = {
             "features": features,
             "ai_score": ai_score,
             "risk_level": self.calculate_risk_level(features, ai_score)
         }
+        self._store_result(url, result)
+        return result
+
+    async def analyze_urls_async(self, urls: List[str]) -> List[Any]:
+        """Analyze many URLs concurrently.
+
+        Feature gathering fans out over the shared session; URLs whose AI
+        call fails are then scored together with a single
+        score_features_batch call instead of one scalar fallback each.
+        Failed analyses are returned in place as the raised exception,
+        like asyncio.gather with return_exceptions=True."""
+        session = await self._get_session()
+        results: List[Any] = [None] * len(urls)
+        pending = []
+        for i, url in enumerate(urls):
+            cached = self._cached_result(url)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        features_list = await asyncio.gather(
+            *[self._collect_features_async(session, urls[i])
+              for i in pending],
+            return_exceptions=True)
+
+        ai_scores = list(await asyncio.gather(*[
+            asyncio.sleep(0, result=None)
+            if isinstance(features, BaseException)
+            else self._try_ai_prediction_async(session, features)
+            for features in features_list
+        ]))
+
+        # One kernel call scores everything the AI endpoint left behind.
+        fallback = [k for k, (features, score)
+                    in enumerate(zip(features_list, ai_scores))
+                    if score is None
+                    and not isinstance(features, BaseException)]
+        if fallback:
+            batch_scores = self.score_features_batch(
+                [features_list[k] for k in fallback])
+            for k, score in zip(fallback, batch_scores):
+                ai_scores[k] = score
+
+        for k, i in enumerate(pending):
+            features = features_list[k]
+            if isinstance(features, BaseException):
+                results[i] = features
+                continue
+            ai_score = ai_scores[k]
+            result = {
+                "features": features,
+                "ai_score": ai_score,
+                "risk_level": self.calculate_risk_level(features, ai_score)
+            }
+            self._store_result(urls[i], result)
+            results[i] = result
+        return results
     
     def check_suspicious_patterns(self, url: str) -> List[str]:
         """Check for suspicious patterns in URL"""
-        matches = []
-        for pattern in self.suspicious_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                matches.append(pattern)
-        return matches
+        url_lc = url.lower()
+        candidates = [
+            (pattern, compiled) for pattern, compiled, literals
+            in self._suspicious_compiled
+            if not literals or any(lit in url_lc for lit in literals)
+        ]
+        if not candidates:
+            return []
+
+        # One pass over the URL rejects the common clean case; only when the
+        # combined regex hits do we identify exactly which patterns matched
+        # (finditer alone misses overlapping patterns).
+        if self._combined is not None and not self._combined.search(url):
+            return []
+
+        return [pattern for pattern, compiled in candidates
+                if compiled.search(url)]
     
     def get_ai_prediction(self, features: Dict[str, Any]) -> float:
         """Get AI model prediction (placeholder for actual AI integration)"""
+        if features["is_whitelisted"]:
+            return 0.0
         try:
             # This would call your AI model API
-            response = requests.post(
+            response = self._http.post(
                 self.config.get("ai_model_endpoint"),
                 json=features,
                 timeout=5
@@ -91,11 +490,43 @@ class PhishingDetector:
         except:
             # Fallback to rule-based scoring
             return self.rule_based_scoring(features)
+
+    async def _try_ai_prediction_async(self, session: aiohttp.ClientSession,
+                                       features: Dict[str, Any]):
+        """AI endpoint probability, or None when the call fails.
+
+        Deliberately not a bare except: a cancelled task must propagate,
+        not turn into a fallback score."""
+        if features["is_whitelisted"]:
+            return 0.0
+        try:
+            async with session.post(
+                self.config.get("ai_model_endpoint"),
+                json=features,
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                data = await response.json()
+            return data.get("phishing_probability", 0.0)
+        except Exception:
+            return None
+
+    async def _get_ai_prediction_async(self, session: aiohttp.ClientSession,
+                                       features: Dict[str, Any]) -> float:
+        """Async counterpart of get_ai_prediction"""
+        score = await self._try_ai_prediction_async(session, features)
+        if score is None:
+            # Fallback to rule-based scoring
+            return self.rule_based_scoring(features)
+        return score
     
     def rule_based_scoring(self, features: Dict[str, Any]) -> float:
         """Enhanced rule-based scoring"""
+        # Whitelisted domains always score clean; skip the feature walk.
+        if features["is_whitelisted"]:
+            return 0.0
+
         score = 0.0
-        
+
         # URL-based features
         if features["has_ip"]:
             score += 0.3
@@ -126,13 +557,53 @@ class PhishingDetector:
         domain_info = features.get("domain_info", {})
         if domain_info.get("is_new_domain", False):
             score += 0.2
-        
-        # Whitelist override
-        if features["is_whitelisted"]:
-            score -= 0.5
-            
+
         return min(1.0, max(0.0, score))
-    
+
+    def score_features_batch(self, features_list: List[Dict[str, Any]]) -> List[float]:
+        """Score many feature dicts with one pass of the vectorized kernel.
+
+        Packs the scalar features into parallel arrays and calls
+        _score_batch (numba-compiled when available). Falls back to the
+        per-dict scalar path when NumPy is not installed."""
+        if np is None or not features_list:
+            return [self.rule_based_scoring(f) for f in features_list]
+
+        n = len(features_list)
+        has_ip = np.zeros(n, dtype=np.bool_)
+        n_patterns = np.zeros(n, dtype=np.int32)
+        domain_len = np.zeros(n, dtype=np.int32)
+        subdomain_count = np.zeros(n, dtype=np.int32)
+        ssl_valid = np.zeros(n, dtype=np.bool_)
+        ssl_self_signed = np.zeros(n, dtype=np.bool_)
+        n_keywords = np.zeros(n, dtype=np.int32)
+        has_password = np.zeros(n, dtype=np.bool_)
+        n_external = np.zeros(n, dtype=np.int32)
+        is_new_domain = np.zeros(n, dtype=np.bool_)
+        is_whitelisted = np.zeros(n, dtype=np.bool_)
+
+        for i, features in enumerate(features_list):
+            ssl_info = features.get("ssl_info", {})
+            content = features.get("content_analysis", {})
+            domain_info = features.get("domain_info", {})
+            has_ip[i] = features.get("has_ip", False)
+            n_patterns[i] = len(features.get("suspicious_patterns", []))
+            domain_len[i] = features.get("domain_length", 0)
+            subdomain_count[i] = features.get("subdomain_count", 0)
+            ssl_valid[i] = ssl_info.get("valid", False)
+            ssl_self_signed[i] = ssl_info.get("is_self_signed", False)
+            n_keywords[i] = len(content.get("suspicious_keywords") or [])
+            has_password[i] = content.get("has_password_field", False)
+            n_external[i] = content.get("external_links_count", 0)
+            is_new_domain[i] = domain_info.get("is_new_domain", False)
+            is_whitelisted[i] = features.get("is_whitelisted", False)
+
+        scores = _score_batch(has_ip, n_patterns, domain_len,
+                              subdomain_count, ssl_valid, ssl_self_signed,
+                              n_keywords, has_password, n_external,
+                              is_new_domain, is_whitelisted)
+        return scores.tolist()
+
     def calculate_risk_level(self, features: Dict[str, Any], ai_score: float) -> str:
         """Calculate overall risk level"""
         if features["is_whitelisted"]:
@@ -144,47 +615,105 @@ class PhishingDetector:
         else:
             return "LOW"
     
+    @staticmethod
+    def cert_fields_dict(raw) -> Dict[str, Any]:
+        """Flatten the RDN tuples from getpeercert into a plain mapping.
+
+        Idempotent: already-flattened dicts pass through, so cached
+        results can be converted safely more than once."""
+        if isinstance(raw, dict):
+            return raw
+        return dict(x[0] for x in raw)
+
+    @staticmethod
+    def _skipped_ssl_info() -> Dict[str, Any]:
+        """ssl_info placeholder for URLs that are not served over HTTPS"""
+        return {
+            "valid": False,
+            "skipped": "non-https URL",
+            "is_self_signed": False
+        }
+
     def check_ssl_certificate(self, domain: str) -> Dict[str, Any]:
-        """Check SSL certificate validity"""
+        """Check SSL certificate validity (successes cached per domain).
+
+        Failures are translated here, outside the cache, so a transient
+        DNS or network error is retried on the next call instead of
+        poisoning the domain for the process lifetime."""
         try:
-            context = ssl.create_default_context(cafile=certifi.where())
-            with socket.create_connection((domain, 443), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert = ssock.getpeercert()
-                    
-                    return {
-                        "valid": True,
-                        "issuer": dict(x[0] for x in cert['issuer']),
-                        "subject": dict(x[0] for x in cert['subject']),
-                        "expires": cert['notAfter'],
-                        "is_self_signed": cert['issuer'] == cert['subject']
-                    }
+            return self._ssl_cached(domain)
         except Exception as e:
             return {
                 "valid": False,
                 "error": str(e),
                 "is_self_signed": True
             }
+
+    def _check_ssl_uncached(self, domain: str) -> Dict[str, Any]:
+        with socket.create_connection((domain, 443), timeout=5) as sock:
+            with self._ssl_ctx.wrap_socket(
+                    sock, server_hostname=domain) as ssock:
+                cert = ssock.getpeercert()
+
+                # Scoring only reads valid/is_self_signed, so the RDN
+                # tuples stay raw; cert_fields_dict flattens them when
+                # a display path needs a mapping.
+                return {
+                    "valid": True,
+                    "issuer": cert['issuer'],
+                    "subject": cert['subject'],
+                    "expires": cert['notAfter'],
+                    "is_self_signed": cert['issuer'] == cert['subject']
+                }
     
-    def analyze_content(self, url: str) -> Dict[str, Any]:
-        """Analyze webpage content for phishing indicators"""
+    def analyze_content(self, url: str,
+                        self_netloc: str = None) -> Dict[str, Any]:
+        """Analyze webpage content for phishing indicators.
+
+        Callers that already parsed the URL pass self_netloc so it is not
+        re-derived here."""
+        if self_netloc is None:
+            self_netloc = urlparse(url).netloc
         try:
-            response = requests.get(url, timeout=10, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract text content
-            text_content = soup.get_text().lower()
-            
-            # Check for suspicious keywords
-            suspicious_keywords = [
-                'verify account', 'suspended', 'urgent action',
-                'click here immediately', 'limited time', 'act now',
-                'confirm identity', 'update payment', 'security alert'
-            ]
-            
-            found_keywords = [kw for kw in suspicious_keywords if kw in text_content]
+            with self._http.get(url, timeout=10, stream=True) as response:
+                body = response.raw.read(MAX_CONTENT_BYTES,
+                                         decode_content=True)
+                encoding = response.encoding
+            return self._parse_content(body, self_netloc, encoding=encoding)
+        except Exception as e:
+            return {"error": str(e), "analyzed": False}
+
+    async def _analyze_content_async(self, session: aiohttp.ClientSession,
+                                     url: str,
+                                     self_netloc: str = None) -> Dict[str, Any]:
+        """Fetch page content with aiohttp, then reuse the shared parser"""
+        if self_netloc is None:
+            self_netloc = urlparse(url).netloc
+        try:
+            async with session.get(
+                url, timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                body = await response.content.read(MAX_CONTENT_BYTES)
+                charset = response.charset
+            return self._parse_content(body, self_netloc, encoding=charset)
+        except Exception as e:
+            return {"error": str(e), "analyzed": False}
+
+    def _parse_content(self, body: bytes, self_netloc: str,
+                       encoding: str = None) -> Dict[str, Any]:
+        """Extract phishing indicators from a fetched HTML body"""
+        try:
+            # Passing the transport-declared encoding skips bs4's charset
+            # detection pass; the strainer limits tree building to the
+            # handful of tags inspected below.
+            soup = BeautifulSoup(body, HTML_PARSER, from_encoding=encoding,
+                                 parse_only=_CONTENT_STRAINER)
+
+            # The keyword scan runs over the raw (capped) body so it is not
+            # limited to text inside the strained tags.
+            text_content = body.decode(encoding or 'utf-8',
+                                       errors='replace').lower()
+            found_keywords = self._find_keywords(text_content)
             
             # Check for forms (login/payment forms)
             forms = soup.find_all('form')
@@ -194,20 +723,21 @@ class PhishingDetector:
                 for input_tag in form.find_all('input')
             )
             
-            # Check for external links
-            links = soup.find_all('a', href=True)
-            external_links = [
-                link['href'] for link in links 
-                if link['href'].startswith('http') and 
-                urlparse(link['href']).netloc != urlparse(url).netloc
-            ]
-            
+            # Count external links: cheap prefix tests per anchor instead
+            # of a ParseResult each.
+            external_links_count = 0
+            for link in soup.find_all('a', href=True):
+                href = link['href']
+                if href.startswith('http') and \
+                        not self._is_same_site(href, self_netloc):
+                    external_links_count += 1
+
             return {
                 "suspicious_keywords": found_keywords,
                 "has_forms": len(forms) > 0,
                 "has_password_field": has_password_field,
                 "form_count": len(forms),
-                "external_links_count": len(external_links),
+                "external_links_count": external_links_count,
                 "title": soup.title.string if soup.title else "",
                 "has_favicon": bool(soup.find('link', rel='icon'))
             }
@@ -215,21 +745,79 @@ class PhishingDetector:
         except Exception as e:
             return {"error": str(e), "analyzed": False}
     
+    @staticmethod
+    def _is_same_site(href: str, self_netloc: str) -> bool:
+        """Prefix test for same-host absolute links, with a boundary check
+        so https://host.evil.com is not mistaken for https://host"""
+        for scheme in ('https://', 'http://'):
+            prefix = scheme + self_netloc
+            if href.startswith(prefix):
+                rest = href[len(prefix):]
+                return rest == '' or rest[0] in '/?#:'
+        return False
+
+    def _find_keywords(self, text: str) -> List[str]:
+        """Find suspicious keywords in lowercased text, single-pass when
+        pyahocorasick is available"""
+        if self._kw_automaton is not None:
+            hits = {kw for _, kw in self._kw_automaton.iter(text)}
+            return [kw for kw in self.SUSPICIOUS_KEYWORDS if kw in hits]
+        return [kw for kw in self.SUSPICIOUS_KEYWORDS if kw in text]
+
     def get_domain_info(self, domain: str) -> Dict[str, Any]:
-        """Get domain registration information"""
+        """Get domain registration information (successes cached per
+        domain; failed lookups are not memoized and retry next call)"""
         try:
-            w = whois.whois(domain)
-            creation_date = w.creation_date
-            if isinstance(creation_date, list):
-                creation_date = creation_date[0]
-            
-            days_old = (datetime.now() - creation_date).days if creation_date else 0
-            
-            return {
-                "creation_date": str(creation_date) if creation_date else None,
-                "days_old": days_old,
-                "registrar": w.registrar,
-                "is_new_domain": days_old < 30 if creation_date else True
-            }
+            return self._whois_cached(domain)
         except Exception as e:
             return {"error": str(e), "is_new_domain": True}
+
+    @staticmethod
+    def _load_domain_ages(path: str) -> Dict[str, datetime]:
+        """Load a local domain -> creation-date CSV so batch scans answer
+        domain age from memory instead of a live WHOIS query"""
+        if not path:
+            return {}
+        table = {}
+        try:
+            with open(path, 'r') as f:
+                for row in csv.reader(f):
+                    if len(row) < 2:
+                        continue
+                    try:
+                        table[row[0].strip().lower()] = \
+                            datetime.fromisoformat(row[1].strip())
+                    except ValueError:
+                        continue
+        except OSError:
+            return {}
+        return table
+
+    @staticmethod
+    def _domain_age_record(creation_date, registrar=None) -> Dict[str, Any]:
+        days_old = (datetime.now() - creation_date).days if creation_date else 0
+        return {
+            "creation_date": str(creation_date) if creation_date else None,
+            "days_old": days_old,
+            "registrar": registrar,
+            "is_new_domain": days_old < 30 if creation_date else True
+        }
+
+    def _domain_info_uncached(self, domain: str) -> Dict[str, Any]:
+        # In-memory table first; live WHOIS only on a miss, with the
+        # answer written back for the rest of the session.
+        with self._cache_lock:
+            creation_date = self._domain_age_table.get(domain.lower())
+        if creation_date is not None:
+            return self._domain_age_record(creation_date)
+
+        w = whois.whois(domain)
+        creation_date = w.creation_date
+        if isinstance(creation_date, list):
+            creation_date = creation_date[0]
+
+        if creation_date:
+            with self._cache_lock:
+                self._domain_age_table[domain.lower()] = creation_date
+
+        return self._domain_age_record(creation_date, w.registrar)
@@ -1,53 +1,75 @@
+from typing import List
+
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from pydantic import BaseModel
 from phishing_detector import PhishingDetector
 import uvicorn
 
-app = FastAPI(title="Phishing Detector API", version="1.0.0")
+# ORJSONResponse serializes with orjson's C encoder and skips the
+# Pydantic response-model validation pass; results are already JSON-safe.
+app = FastAPI(title="Phishing Detector API", version="1.0.0",
+              default_response_class=ORJSONResponse)
 
 # Initialize detector
 detector = PhishingDetector()
 
+@app.on_event("shutdown")
+async def close_detector():
+    """Release the detector's shared aiohttp connection pool"""
+    await detector.aclose()
+
 class URLRequest(BaseModel):
     url: str
 
-class DetectionResponse(BaseModel):
-    url: str
-    risk_level: str
-    ai_score: float
-    features: dict
-    recommendations: list
+class BatchURLRequest(BaseModel):
+    urls: List[str]
+
+def build_response(url, result):
+    """Shape a detector result into the /analyze response dict"""
+    # The detector keeps cert issuer/subject as raw RDN tuples;
+    # flatten them here so the API keeps returning plain mappings.
+    ssl_info = result["features"].get("ssl_info", {})
+    for key in ("issuer", "subject"):
+        if key in ssl_info:
+            ssl_info[key] = PhishingDetector.cert_fields_dict(ssl_info[key])
 
-@app.post("/analyze", response_model=DetectionResponse)
+    return {
+        "url": url,
+        "risk_level": result["risk_level"],
+        "ai_score": result["ai_score"],
+        "features": result["features"],
+        "recommendations": generate_recommendations(result)
+    }
+
+@app.post("/analyze")
 async def analyze_url(request: URLRequest):
     """Analyze a URL for phishing indicators"""
     try:
-        result = detector.analyze_url(request.url)
-        
-        # Generate recommendations
-        recommendations = generate_recommendations(result)
-        
-        return DetectionResponse(
-            url=request.url,
-            risk_level=result["risk_level"],
-            ai_score=result["ai_score"],
-            features=result["features"],
-            recommendations=recommendations
-        )
+        result = await detector.analyze_url_async(request.url)
+        return build_response(request.url, result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze_batch")
+async def analyze_batch(request: BatchURLRequest):
+    """Analyze a list of URLs concurrently; URLs the AI endpoint cannot
+    score are batch-scored with one vectorized kernel call"""
+    results = await detector.analyze_urls_async(request.urls)
+    return [
+        {"url": url, "error": str(result)}
+        if isinstance(result, Exception)
+        else build_response(url, result)
+        for url, result in zip(request.urls, results)
+    ]
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "phishing-detector"}
 
-@app.get("/", response_class=HTMLResponse)
-async def get_web_interface():
-    """Serve the web interface"""
-    return """
+INDEX_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -136,36 +158,42 @@ async def get_web_interface():
     </html>
     """
 
+# Encode the page once at import; every GET / reuses the same response
+# body instead of re-encoding the multi-KB string per request.
+_INDEX_RESPONSE = HTMLResponse(content=INDEX_HTML)
+
+@app.get("/", response_class=HTMLResponse)
+async def get_web_interface():
+    """Serve the web interface"""
+    return _INDEX_RESPONSE
+
+# Recommendation rules as (predicate, message) pairs, evaluated in order.
+# Each predicate takes (features, risk_level); keeping the logic as data
+# means new rules are one line and a batch path can evaluate them as masks.
+_RULES = (
+    (lambda f, r: r == "HIGH",
+     "⚠️ HIGH RISK: Do not enter personal information on this site"),
+    (lambda f, r: r == "HIGH",
+     "🚫 Avoid clicking links or downloading files"),
+    (lambda f, r: r == "HIGH",
+     "📞 Contact the legitimate organization directly if needed"),
+    (lambda f, r: f.get("has_ip"),
+     "🔍 Site uses IP address instead of domain name - suspicious"),
+    (lambda f, r: not f.get("ssl_info", {}).get("valid"),
+     "🔒 No valid SSL certificate - data transmission not secure"),
+    (lambda f, r: f.get("content_analysis", {}).get("suspicious_keywords"),
+     "⚡ Contains urgent/suspicious language - be cautious"),
+    (lambda f, r: f.get("domain_info", {}).get("is_new_domain"),
+     "📅 Domain is very new - exercise extra caution"),
+    (lambda f, r: r == "LOW",
+     "✅ Site appears legitimate, but always verify URLs carefully"),
+)
+
 def generate_recommendations(result):
     """Generate security recommendations based on analysis"""
-    recommendations = []
     features = result["features"]
     risk_level = result["risk_level"]
-    
-    if risk_level == "HIGH":
-        recommendations.append("⚠️ HIGH RISK: Do not enter personal information on this site")
-        recommendations.append("🚫 Avoid clicking links or downloading files")
-        recommendations.append("📞 Contact the legitimate organization directly if needed")
-    
-    if features.get("has_ip"):
-        recommendations.append("🔍 Site uses IP address instead of domain name - suspicious")
-    
-    ssl_info = features.get("ssl_info", {})
-    if not ssl_info.get("valid"):
-        recommendations.append("🔒 No valid SSL certificate - data transmission not secure")
-    
-    content = features.get("content_analysis", {})
-    if content.get("suspicious_keywords"):
-        recommendations.append("⚡ Contains urgent/suspicious language - be cautious")
-    
-    domain_info = features.get("domain_info", {})
-    if domain_info.get("is_new_domain"):
-        recommendations.append("📅 Domain is very new - exercise extra caution")
-    
-    if risk_level == "LOW":
-        recommendations.append("✅ Site appears legitimate, but always verify URLs carefully")
-    
-    return recommendations
+    return [msg for pred, msg in _RULES if pred(features, risk_level)]
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file